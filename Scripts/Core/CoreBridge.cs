@@ -1,6 +1,7 @@
 using Godot;
 using Godot.Collections;
 using System.Collections.Generic;
+using System.Text.Json;
 
 public partial class CoreBridge : Node
 {
@@ -21,6 +22,8 @@ public partial class CoreBridge : Node
     private string _difficulty = "Medium";
     private bool _noMercy = false;
 
+    private const string RunTelemetryPath = "user://telemetry_runs.jsonl";
+
     private ulong _lastAutoSlowMs;
     private ulong _rescueStabilityUntilMs;
 
@@ -442,6 +445,25 @@ public partial class CoreBridge : Node
         _lastSpeedCalcMs = _startMs;
         _smoothedFallSpeed = _config.BaseFallSpeed;
         _lastTargetSpeed = _smoothedFallSpeed;
+        _metrics.BeginRun();
+    }
+
+    public void AppendRunTelemetry(string difficultyKey, int day, float finalBoardFill)
+    {
+        var record = _metrics.BuildRunRecord(difficultyKey, day, GetElapsedSeconds(), finalBoardFill);
+        try
+        {
+            var mode = FileAccess.FileExists(RunTelemetryPath) ? FileAccess.ModeFlags.ReadWrite : FileAccess.ModeFlags.Write;
+            using var file = FileAccess.Open(RunTelemetryPath, mode);
+            if (file == null)
+                return;
+            file.SeekEnd();
+            file.StoreLine(JsonSerializer.Serialize(record));
+        }
+        catch (System.Exception e)
+        {
+            GD.PrintErr($"Run telemetry append failed: {e}");
+        }
     }
 
     public void TriggerRescueStability()
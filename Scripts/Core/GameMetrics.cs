@@ -1,4 +1,5 @@
 using Godot;
+using System.Text.Json.Serialization;
 
 public class GameMetrics
 {
@@ -8,12 +9,41 @@ public class GameMetrics
     private float _avgMoveTimeSec = 2.0f;
     private float _avgBoardFill = 0.2f;
 
+    private int _runMoves;
+    private int _runClears;
+    private float _runBoardFillSum;
+
     public void RegisterMove(float moveTimeSec, int clearedCount, float boardFill)
     {
         _moves++;
         _clears += clearedCount > 0 ? 1 : 0;
         _avgMoveTimeSec = Lerp(_avgMoveTimeSec, moveTimeSec, 0.12f);
         _avgBoardFill = Lerp(_avgBoardFill, boardFill, 0.10f);
+
+        _runMoves++;
+        _runClears += clearedCount > 0 ? 1 : 0;
+        _runBoardFillSum += boardFill;
+    }
+
+    public void BeginRun()
+    {
+        _runMoves = 0;
+        _runClears = 0;
+        _runBoardFillSum = 0f;
+    }
+
+    public RunRecord BuildRunRecord(string difficulty, int day, float durationSec, float finalBoardFill)
+    {
+        return new RunRecord
+        {
+            Difficulty = difficulty,
+            Day = day,
+            DurationSec = durationSec,
+            Moves = _runMoves,
+            Clears = _runClears,
+            AvgBoardFill = _runMoves <= 0 ? 0f : _runBoardFillSum / _runMoves,
+            FinalBoardFill = finalBoardFill
+        };
     }
 
     public void RegisterCancelledDrag() => _cancelledDrags++;
@@ -42,3 +72,14 @@ public struct MetricsSnapshot
     public float CancelRate;
     public int Clears;
 }
+
+public struct RunRecord
+{
+    [JsonPropertyName("difficulty")] public string Difficulty { get; set; }
+    [JsonPropertyName("day")] public int Day { get; set; }
+    [JsonPropertyName("duration")] public float DurationSec { get; set; }
+    [JsonPropertyName("moves")] public int Moves { get; set; }
+    [JsonPropertyName("clears")] public int Clears { get; set; }
+    [JsonPropertyName("board_fill")] public float AvgBoardFill { get; set; }
+    [JsonPropertyName("final_board_fill")] public float FinalBoardFill { get; set; }
+}
@@ -704,6 +704,7 @@ func _trigger_game_over() -> void:
 	# Save global progress (player profile)
 	Save.add_unique_day_if_needed(true)
 	var difficulty_key = Save.get_current_difficulty_key()
+	core.call("AppendRunTelemetry", difficulty_key, Save.get_player_level(), _board_fill_ratio())
 	var best_by_difficulty = Save.get_best_score_by_difficulty()
 	var previous_best = int(best_by_difficulty.get(difficulty_key, 0))
 	Save.update_best(score, level)
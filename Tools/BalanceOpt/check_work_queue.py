@@ -0,0 +1,73 @@
+"""Check that a fit over FileWorkQueue with local worker processes matches the serial fit.
+
+A short job timeout forces re-issued jobs and duplicate results, so the check
+also covers the coordinator's fault tolerance. Exits non-zero on mismatch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+if __package__ in (None, ""):
+    THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+    if THIS_DIR not in sys.path:
+        sys.path.insert(0, THIS_DIR)
+    from model import default_params  # type: ignore
+    from optimizer import fit  # type: ignore
+    from work_queue import FileWorkQueue  # type: ignore
+else:
+    from .model import default_params
+    from .optimizer import fit
+    from .work_queue import FileWorkQueue
+
+RUN_FIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_fit.py")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare a distributed localhost fit against the serial fit.")
+    parser.add_argument("--workers", type=int, default=3, help="Local worker processes")
+    parser.add_argument("--timeout", type=float, default=0.05, help="Job timeout; keep it short to force re-issues")
+    parser.add_argument("--runs", type=int, default=15, help="Simulation runs per cell")
+    parser.add_argument("--seed", type=int, default=3, help="Base random seed")
+    args = parser.parse_args()
+
+    fit_kwargs = dict(runs=args.runs, seed=args.seed, fast=True, random_samples=4, es_iters=3, pop_size=5)
+    serial_best, serial_info = fit(default_params(), **fit_kwargs)
+
+    with tempfile.TemporaryDirectory(prefix="balance-queue-") as root:
+        queue = FileWorkQueue(root, timeout=args.timeout, poll=0.05)
+        workers = [
+            subprocess.Popen([sys.executable, RUN_FIT, "--worker", "--queue", root], stdout=subprocess.PIPE, text=True)
+            for _ in range(args.workers)
+        ]
+        try:
+            dist_best, dist_info = fit(default_params(), evaluator=queue, **fit_kwargs)
+        finally:
+            queue.stop()
+            try:
+                outputs = [w.communicate(timeout=120)[0] for w in workers]
+            except subprocess.TimeoutExpired:
+                for w in workers:
+                    w.kill()
+                    w.communicate()
+                print("Workers did not exit after STOP; killed them")
+                sys.exit(1)
+
+    jobs = len(serial_info["evaluations"])
+    served = sum(int(out.split()[2]) for out in outputs if out.startswith("Worker evaluated"))
+    same = json.dumps([serial_info["score"], serial_best], sort_keys=True) == json.dumps(
+        [dist_info["score"], dist_best], sort_keys=True
+    ) and [e["score"] for e in serial_info["evaluations"]] == [e["score"] for e in dist_info["evaluations"]]
+
+    print(f"{args.workers} workers served {served} evaluations for {jobs} jobs ({served - jobs} duplicates)")
+    print("Distributed fit matches serial fit" if same else "MISMATCH between distributed and serial fit")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import json
+import re
+from typing import Any, Dict, List
 
 DIFFICULTIES = ["easy", "medium", "hard", "nm"]
 BUCKETS = ["BASE"]
 
+DAY_BUCKET_RE = re.compile(r"D(\d+)(?:-\d+|\+)")
+
+# Difficulty keys written by the game (SaveManager best-score keys) -> model difficulties.
+DIFFICULTY_ALIASES = {
+    "easy": "easy",
+    "medium": "medium",
+    "hard": "hard",
+    "nm": "nm",
+    "hard_plus_no_mercy": "nm",
+}
+
 INITIAL_PEAKS = {
     "easy": [180.0, 360.0, 600.0],
     "medium": [150.0, 300.0, 480.0],
@@ -38,10 +51,15 @@ BASE_PEAK_REACH = {
 }
 
 
+def day_bucket_name(lo: int, hi: int | None) -> str:
+    """Name the day range ``[lo, hi)``; ``hi=None`` is open-ended."""
+    return f"D{lo}+" if hi is None else f"D{lo}-{hi - 1}"
+
+
 def bucket_to_representative_day(bucket: str) -> int:
-    """Single baseline bucket maps to day zero."""
-    _ = bucket
-    return 0
+    """Day buckets (``D7-13``, ``D30+``) map to their first day; any other name maps to day zero."""
+    match = DAY_BUCKET_RE.fullmatch(bucket)
+    return int(match.group(1)) if match else 0
 
 
 def build_default_targets() -> Dict[str, Dict[str, Dict[str, List[float]]]]:
@@ -57,6 +75,19 @@ def build_default_targets() -> Dict[str, Dict[str, Dict[str, List[float]]]]:
     return targets
 
 
+def load_targets(path: str) -> Dict[str, Any]:
+    """Load a targets file (e.g. from ingest_telemetry.py) in build_default_targets() shape."""
+    with open(path, "r", encoding="utf-8") as f:
+        targets = json.load(f)
+    for key in ("median_seconds", "peak_reach"):
+        for bucket, per_diff in targets[key].items():
+            missing = [diff for diff in DIFFICULTIES if diff not in per_diff]
+            if missing:
+                raise ValueError(f"{path}: {key}[{bucket}] is missing difficulties {missing}")
+        targets[key] = dict(sorted(targets[key].items(), key=lambda kv: bucket_to_representative_day(kv[0])))
+    return targets
+
+
 def parameter_bounds() -> Dict[str, Dict[str, tuple]]:
     """Bounds for optimized coefficients."""
     bounds = {
@@ -0,0 +1,285 @@
+"""Stream play-session telemetry into fit targets with bounded memory.
+
+The game appends one record per finished run to ``user://telemetry_runs.jsonl``
+(``difficulty``, ``day``, ``duration``, ``moves``, ``clears``, ``board_fill``).
+CSV logs with the same column names are accepted too, optionally gzipped.
+Memory use depends only on the number of (bucket, difficulty) cells, not on
+the number of runs: medians come from P-square quantile sketches and peak
+reach from counters against the reference peak times in ``INITIAL_PEAKS``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+if __package__ in (None, ""):
+    THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+    if THIS_DIR not in sys.path:
+        sys.path.insert(0, THIS_DIR)
+    from default_targets import (  # type: ignore
+        BASE_MEDIAN_SECONDS,
+        BASE_PEAK_REACH,
+        DIFFICULTIES,
+        DIFFICULTY_ALIASES,
+        INITIAL_PEAKS,
+        day_bucket_name,
+    )
+    from model import save_json  # type: ignore
+else:
+    from .default_targets import (
+        BASE_MEDIAN_SECONDS,
+        BASE_PEAK_REACH,
+        DIFFICULTIES,
+        DIFFICULTY_ALIASES,
+        INITIAL_PEAKS,
+        day_bucket_name,
+    )
+    from .model import save_json
+
+
+OPTIONAL_FIELDS = ("moves", "clears", "board_fill")
+
+
+class P2Quantile:
+    """P-square streaming quantile estimator (Jain & Chlamtac, 1985).
+
+    Tracks one quantile with five markers; exact for fewer than five samples.
+    """
+
+    def __init__(self, p: float = 0.5) -> None:
+        self.p = p
+        self.count = 0
+        self._q: List[float] = []
+        self._n = [0, 1, 2, 3, 4]
+        self._np = [0.0, 2.0 * p, 4.0 * p, 2.0 + 2.0 * p, 4.0]
+        self._dn = [0.0, p / 2.0, p, (1.0 + p) / 2.0, 1.0]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        q, n = self._q, self._n
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        for i in range(1, 4):
+            d = self._np[i] - n[i]
+            if (d >= 1.0 and n[i + 1] - n[i] > 1) or (d <= -1.0 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / float(n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / float(n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / float(n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / float(n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    def value(self) -> float:
+        if self.count == 0:
+            raise ValueError("no samples")
+        if self.count <= 5:
+            pos = self.p * (self.count - 1)
+            lo = int(pos)
+            hi = min(lo + 1, self.count - 1)
+            return self._q[lo] + (self._q[hi] - self._q[lo]) * (pos - lo)
+        return self._q[2]
+
+
+class CellStats:
+    """Running statistics for one (bucket, difficulty) cell."""
+
+    def __init__(self, peak_seconds: List[float]) -> None:
+        self.peak_seconds = peak_seconds
+        self.runs = 0
+        self.median = P2Quantile(0.5)
+        self.reached = [0] * len(peak_seconds)
+        # Optional fields are averaged over the records that carry them.
+        self.sums = {key: 0.0 for key in OPTIONAL_FIELDS}
+        self.counts = {key: 0 for key in OPTIONAL_FIELDS}
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        duration = rec["duration"]
+        self.runs += 1
+        self.median.add(duration)
+        for i, peak in enumerate(self.peak_seconds):
+            if duration >= peak:
+                self.reached[i] += 1
+        for key in OPTIONAL_FIELDS:
+            if key in rec:
+                self.sums[key] += rec[key]
+                self.counts[key] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        runs = float(self.runs)
+        out: Dict[str, Any] = {
+            "runs": self.runs,
+            "median_seconds": self.median.value(),
+            "peak_reach": [c / runs for c in self.reached],
+        }
+        for key in OPTIONAL_FIELDS:
+            count = self.counts[key]
+            out[f"mean_{key}"] = self.sums[key] / count if count else None
+        return out
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _finite(value: Any) -> float:
+    out = float(value)
+    if not math.isfinite(out):
+        raise ValueError(f"non-finite value {value!r}")
+    return out
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[Dict[str, Any] | None]:
+    """Yield one normalized record per line; malformed lines yield ``None``."""
+    for path in paths:
+        is_csv = path.endswith(".csv") or path.endswith(".csv.gz")
+        f = _open_text(path)
+        try:
+            rows: Iterable[Any] = csv.DictReader(f) if is_csv else f
+            for row in rows:
+                if not is_csv and not row.strip():
+                    continue
+                try:
+                    raw = row if is_csv else json.loads(row)
+                    rec = {
+                        "difficulty": DIFFICULTY_ALIASES[str(raw["difficulty"]).strip().lower()],
+                        "day": int(_finite(raw["day"])),
+                        "duration": _finite(raw["duration"]),
+                    }
+                    for key in OPTIONAL_FIELDS:
+                        if raw.get(key) not in (None, ""):
+                            rec[key] = _finite(raw[key])
+                except (KeyError, TypeError, ValueError, OverflowError):
+                    yield None
+                    continue
+                yield rec
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def bucket_for_day(day: int, edges: List[int]) -> str | None:
+    """Map a day to its ``[edge_i, edge_i+1)`` bucket name; days before the first edge are dropped."""
+    if day < edges[0]:
+        return None
+    for lo, hi in zip(edges, edges[1:]):
+        if day < hi:
+            return day_bucket_name(lo, hi)
+    return day_bucket_name(edges[-1], None)
+
+
+def ingest(paths: Iterable[str], edges: List[int], min_runs: int = 50) -> Dict[str, Any]:
+    """Stream telemetry logs and build a targets object for ``objective()``.
+
+    Cells with fewer than ``min_runs`` runs fall back to the BASE constants.
+    """
+    buckets = [day_bucket_name(lo, hi) for lo, hi in zip(edges, list(edges[1:]) + [None])]
+    cells: Dict[Tuple[str, str], CellStats] = {}
+    skipped = 0
+    for rec in iter_records(paths):
+        bucket = None if rec is None else bucket_for_day(rec["day"], edges)
+        if rec is None or bucket is None or rec["duration"] < 0.0:
+            skipped += 1
+            continue
+        key = (bucket, rec["difficulty"])
+        if key not in cells:
+            cells[key] = CellStats(INITIAL_PEAKS[rec["difficulty"]])
+        cells[key].add(rec)
+
+    targets: Dict[str, Any] = {
+        "median_seconds": {},
+        "peak_reach": {},
+        "peak_seconds": {diff: list(INITIAL_PEAKS[diff]) for diff in DIFFICULTIES},
+        "observed": {},
+        "skipped_records": skipped,
+    }
+    for bucket in buckets:
+        medians: Dict[str, float] = {}
+        peaks: Dict[str, List[float]] = {}
+        observed: Dict[str, Any] = {}
+        for diff in DIFFICULTIES:
+            stats = cells.get((bucket, diff))
+            if stats is not None and stats.runs >= min_runs:
+                summary = stats.summary()
+                medians[diff] = summary["median_seconds"]
+                peaks[diff] = summary["peak_reach"]
+                observed[diff] = summary
+            else:
+                medians[diff] = BASE_MEDIAN_SECONDS[diff]
+                peaks[diff] = list(BASE_PEAK_REACH[diff])
+                observed[diff] = {"runs": 0 if stats is None else stats.runs, "fallback": True}
+        targets["median_seconds"][bucket] = medians
+        targets["peak_reach"][bucket] = peaks
+        targets["observed"][bucket] = observed
+    return targets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build fit targets from per-run play telemetry (JSONL or CSV).")
+    parser.add_argument("logs", nargs="+", help="Telemetry files (.jsonl, .csv, optionally .gz; '-' for stdin)")
+    parser.add_argument(
+        "--day-edges",
+        type=str,
+        default="0",
+        help="Comma-separated first days of each bucket, e.g. 0,3,7,14,30",
+    )
+    parser.add_argument("--min-runs", type=int, default=50, help="Minimum runs per cell before it replaces the BASE target")
+    parser.add_argument(
+        "--out",
+        type=str,
+        default="Tools/BalanceOpt/telemetry_targets.json",
+        help="Output targets JSON for run_fit.py --targets",
+    )
+    args = parser.parse_args()
+
+    edges = sorted({int(e) for e in args.day_edges.split(",") if e.strip()})
+    if not edges:
+        parser.error("--day-edges needs at least one day")
+
+    targets = ingest(args.logs, edges, min_runs=args.min_runs)
+    out_path = args.out if os.path.isabs(args.out) else os.path.join(os.getcwd(), args.out)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    save_json(out_path, targets)
+
+    print(f"Saved targets to: {out_path}")
+    for bucket, per_diff in targets["observed"].items():
+        counts = ", ".join(f"{diff}={per_diff[diff]['runs']}" for diff in DIFFICULTIES)
+        print(f"{bucket}: {counts}")
+    if targets["skipped_records"]:
+        print(f"Skipped {targets['skipped_records']} malformed or out-of-range records")
+
+
+if __name__ == "__main__":
+    main()
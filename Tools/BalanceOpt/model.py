@@ -5,7 +5,9 @@ from __future__ import annotations
 import json
 import math
 import random
+import warnings
 from copy import deepcopy
+from functools import lru_cache
 from statistics import median
 from typing import Any, Dict, List, Tuple
 
@@ -197,59 +199,112 @@ def simulate_run(params: Dict[str, Any], diff: str, day: int, rng: random.Random
     }
 
 
-def simulate_metrics(
+def cell_key(bucket: str, diff: str) -> str:
+    return f"{bucket}/{diff}"
+
+
+CELL_CACHE_SIZE = 4096
+
+
+def simulate_cell(
     params: Dict[str, Any],
+    bucket: str,
+    diff: str,
     runs: int = 500,
     seed: int = 1,
     fast: bool = False,
-) -> Dict[str, Dict[str, Dict[str, Any]]]:
-    """Simulate all (bucket, difficulty) pairs and aggregate metrics."""
-    rng = random.Random(seed)
-    result: Dict[str, Dict[str, Dict[str, Any]]] = {bucket: {} for bucket in BUCKETS}
+    peak_seconds: List[float] | None = None,
+) -> Dict[str, Any]:
+    """Simulate one (bucket, difficulty) cell on its own seeded random stream.
+
+    Peak reach is measured at the candidate's own ``T1..T3`` unless fixed
+    ``peak_seconds`` are given (telemetry targets are measured that way).
+
+    A cell depends only on ``params["global"]`` and its own difficulty block,
+    so results are memoized on those blocks plus the seed stream, run count,
+    fidelity and peak thresholds; candidates that change one difficulty reuse
+    the other cells.
+    """
+    cell = _simulate_cell_cached(
+        json.dumps(params["global"], sort_keys=True),
+        json.dumps(params["difficulty"][diff], sort_keys=True),
+        bucket,
+        diff,
+        runs,
+        seed,
+        fast,
+        None if peak_seconds is None else tuple(float(p) for p in peak_seconds),
+    )
+    return deepcopy(cell)
+
+
+@lru_cache(maxsize=CELL_CACHE_SIZE)
+def _simulate_cell_cached(
+    global_json: str,
+    diff_json: str,
+    bucket: str,
+    diff: str,
+    runs: int,
+    seed: int,
+    fast: bool,
+    peak_seconds: Tuple[float, ...] | None,
+) -> Dict[str, Any]:
+    params = {"global": json.loads(global_json), "difficulty": {diff: json.loads(diff_json)}}
+    rng = random.Random(f"{seed}/{cell_key(bucket, diff)}")
     dt = 2.0 if fast else 1.0
     tmax = 1800.0 if fast else 2400.0
+    day = bucket_to_representative_day(bucket)
+
+    durations: List[float] = []
+    peak_counts = [0, 0, 0]
+    for _ in range(runs):
+        out = simulate_run(params, diff, day, rng=rng, dt=dt, tmax=tmax)
+        durations.append(out["duration"])
+        for i in range(3):
+            if peak_seconds is None:
+                peak_counts[i] += out["reached"][i]
+            elif out["duration"] >= peak_seconds[i]:
+                peak_counts[i] += 1
+    return {
+        "median_seconds": float(median(durations)),
+        "peak_reach": [c / float(runs) for c in peak_counts],
+        "mean_seconds": sum(durations) / float(len(durations)),
+    }
 
-    for bucket in BUCKETS:
-        day = bucket_to_representative_day(bucket)
-        for diff in DIFFICULTIES:
-            durations: List[float] = []
-            peak_counts = [0, 0, 0]
-            for _ in range(runs):
-                out = simulate_run(params, diff, day, rng=rng, dt=dt, tmax=tmax)
-                durations.append(out["duration"])
-                for i in range(3):
-                    peak_counts[i] += out["reached"][i]
-            result[bucket][diff] = {
-                "median_seconds": float(median(durations)),
-                "peak_reach": [c / float(runs) for c in peak_counts],
-                "mean_seconds": sum(durations) / float(len(durations)),
-            }
-    return result
 
+def cell_cache_info() -> Any:
+    """Hit/miss counters of the per-cell simulation cache."""
+    return _simulate_cell_cached.cache_info()
 
-def objective(
+
+def simulate_metrics(
     params: Dict[str, Any],
-    targets: Dict[str, Any] | None = None,
     runs: int = 500,
     seed: int = 1,
     fast: bool = False,
-) -> Tuple[float, Dict[str, Any]]:
-    """Compute objective value and return detailed metrics."""
-    targets = targets or build_default_targets()
-    metrics = simulate_metrics(params, runs=runs, seed=seed, fast=fast)
+    buckets: List[str] | None = None,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Simulate all (bucket, difficulty) pairs and aggregate metrics."""
+    buckets = buckets or BUCKETS
+    result: Dict[str, Dict[str, Dict[str, Any]]] = {bucket: {} for bucket in buckets}
+    for bucket in buckets:
+        for diff in DIFFICULTIES:
+            result[bucket][diff] = simulate_cell(params, bucket, diff, runs=runs, seed=seed, fast=fast)
+    return result
+
 
+def _cell_error(cell: Dict[str, Any], targets: Dict[str, Any], bucket: str, diff: str) -> float:
     med_weight = 1.0 / (120.0 * 120.0)
     peak_weight = 4.0
-    total = 0.0
+    em = cell["median_seconds"] - targets["median_seconds"][bucket][diff]
+    err = med_weight * em * em
+    for i in range(3):
+        ep = cell["peak_reach"][i] - targets["peak_reach"][bucket][diff][i]
+        err += peak_weight * ep * ep
+    return err
 
-    for bucket in BUCKETS:
-        for diff in DIFFICULTIES:
-            em = metrics[bucket][diff]["median_seconds"] - targets["median_seconds"][bucket][diff]
-            total += med_weight * em * em
-            for i in range(3):
-                ep = metrics[bucket][diff]["peak_reach"][i] - targets["peak_reach"][bucket][diff][i]
-                total += peak_weight * ep * ep
 
+def _regularization(params: Dict[str, Any]) -> float:
     reg = 0.0
     g = params["global"]
     reg += 0.5 * max(0.0, g["kdd"] - 0.55) ** 2
@@ -257,12 +312,83 @@ def objective(
     for diff in DIFFICULTIES:
         d = params["difficulty"][diff]
         reg += 1.2 * max(0.0, d["Atail"] - 0.18) ** 2
-    total += reg
+    return reg
+
+
+def objective(
+    params: Dict[str, Any],
+    targets: Dict[str, Any] | None = None,
+    runs: int = 500,
+    seed: int = 1,
+    fast: bool = False,
+    abort_above: float | None = None,
+    cell_order: List[str] | None = None,
+    cell_seeds: Dict[str, int] | None = None,
+) -> Tuple[float, Dict[str, Any]]:
+    """Compute objective value and return detailed metrics.
+
+    Buckets are taken from ``targets`` (default: the BASE bucket). The
+    simulator does not depend on day yet, so multi-bucket targets warn.
+    When ``targets`` has ``peak_seconds`` (per difficulty), simulated peak
+    reach is measured at those fixed times, matching how the target was
+    measured, instead of at the candidate's own ``T1..T3``.
+
+    Every cell error and the regularization are non-negative, so the running
+    total is a lower bound on the final score. With ``abort_above`` set, cells
+    are simulated in ``cell_order`` (``"BUCKET/diff"`` keys, worst expected
+    first) and evaluation stops once the bound exceeds the threshold; the
+    partial total is returned with ``info["pruned"]`` set.
+
+    ``cell_seeds`` overrides ``seed`` per difficulty, e.g. to pin the cells a
+    single-difficulty fit leaves untouched to one cached seed stream.
+    """
+    targets = targets or build_default_targets()
+    buckets = list(targets["median_seconds"])
+    if len(buckets) > 1:
+        warnings.warn(
+            f"simulate_run ignores the player day, so buckets {buckets} simulate identically; "
+            "the fit can only match their average",
+            stacklevel=2,
+        )
+    cells = [(bucket, diff) for bucket in buckets for diff in DIFFICULTIES]
+    peak_seconds: Dict[str, List[float]] = targets.get("peak_seconds", {})
+    if cell_order:
+        rank = {key: i for i, key in enumerate(cell_order)}
+        cells.sort(key=lambda c: rank.get(cell_key(*c), len(rank)))
+
+    reg = _regularization(params)
+    total = reg
+    metrics: Dict[str, Dict[str, Dict[str, Any]]] = {bucket: {} for bucket in buckets}
+    cell_errors: Dict[str, float] = {}
+    info = {"metrics": metrics, "targets": targets, "regularization": reg, "cell_errors": cell_errors, "pruned": False}
+
+    for bucket, diff in cells:
+        cell_seed = seed if cell_seeds is None else cell_seeds.get(diff, seed)
+        cell = simulate_cell(
+            params,
+            bucket,
+            diff,
+            runs=runs,
+            seed=cell_seed,
+            fast=fast,
+            peak_seconds=peak_seconds.get(diff),
+        )
+        metrics[bucket][diff] = cell
+        cell_errors[cell_key(bucket, diff)] = _cell_error(cell, targets, bucket, diff)
+        total += cell_errors[cell_key(bucket, diff)]
+        if abort_above is not None and total > abort_above and len(cell_errors) < len(cells):
+            info["pruned"] = True
+            break
+
+    return total, info
+
 
-    return total, {"metrics": metrics, "targets": targets, "regularization": reg}
+def load_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
-def save_json(path: str, data: Dict[str, Any]) -> None:
+def save_json(path: str, data: Any) -> None:
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, sort_keys=True)
 
@@ -2,19 +2,27 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import random
 from copy import deepcopy
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
 try:
-    from .default_targets import DIFFICULTIES, parameter_bounds
+    from .default_targets import DIFFICULTIES, build_default_targets, parameter_bounds
     from .model import deep_copy_params, objective
 except ImportError:
-    from default_targets import DIFFICULTIES, parameter_bounds
+    from default_targets import DIFFICULTIES, build_default_targets, parameter_bounds
     from model import deep_copy_params, objective
 
 
 Slot = Tuple[Tuple[str, ...], float, float]
+Evaluator = Callable[[List[Dict[str, Any]]], List[Tuple[float, Dict[str, Any]]]]
+
+
+def serial_evaluator(jobs: List[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any]]]:
+    """Evaluate ``objective`` keyword-argument jobs in-process, in order."""
+    return [objective(**job) for job in jobs]
 
 
 def _get_ref(obj: Dict[str, Any], path: Tuple[str, ...]) -> Any:
@@ -31,23 +39,29 @@ def _set_ref(obj: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
     cur[path[-1]] = value
 
 
-def _slots(params: Dict[str, Any]) -> List[Slot]:
+def _slots(params: Dict[str, Any], only_difficulty: str | None = None) -> List[Slot]:
     bounds = parameter_bounds()
     slots: List[Slot] = []
 
-    for key, (lo, hi) in bounds["global"].items():
-        slots.append((("global", key), lo, hi))
+    if only_difficulty is None:
+        for key, (lo, hi) in bounds["global"].items():
+            slots.append((("global", key), lo, hi))
 
-    for diff in DIFFICULTIES:
+    for diff in DIFFICULTIES if only_difficulty is None else [only_difficulty]:
         for key, (lo, hi) in bounds[diff].items():
             slots.append((("difficulty", diff, key), lo, hi))
 
     return slots
 
 
-def randomize_params(base: Dict[str, Any], rng: random.Random, scale: float = 1.0) -> Dict[str, Any]:
+def randomize_params(
+    base: Dict[str, Any],
+    rng: random.Random,
+    scale: float = 1.0,
+    only_difficulty: str | None = None,
+) -> Dict[str, Any]:
     cand = deep_copy_params(base)
-    for path, lo, hi in _slots(cand):
+    for path, lo, hi in _slots(cand, only_difficulty):
         cur = float(_get_ref(cand, path))
         span = (hi - lo) * scale
         if scale >= 1.0:
@@ -70,6 +84,17 @@ def _enforce_structure(params: Dict[str, Any]) -> None:
         d["pcap"] = max(d["pcap"], d["p0"] + 0.02)
 
 
+def _recenter(elite: List[Tuple[float, Dict[str, Any], Dict[str, Any]]], slots: List[Slot]) -> Dict[str, Any]:
+    """Average elite coefficients into a new ES center."""
+    center = deepcopy(elite[0][1])
+    for path, lo, hi in slots:
+        vals = [float(_get_ref(e[1], path)) for e in elite]
+        avg = sum(vals) / len(vals)
+        _set_ref(center, path, max(lo, min(hi, avg)))
+    _enforce_structure(center)
+    return center
+
+
 def fit(
     initial_params: Dict[str, Any],
     runs: int,
@@ -78,43 +103,175 @@ def fit(
     random_samples: int = 36,
     es_iters: int = 42,
     pop_size: int = 12,
+    archive: List[Dict[str, Any]] | None = None,
+    sigma0: float = 0.45,
+    evaluator: Evaluator | None = None,
+    prune: bool = False,
+    targets: Dict[str, Any] | None = None,
+    only_difficulty: str | None = None,
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    """Optimize parameters with broad random search then local ES."""
+    """Optimize parameters with broad random search then local ES.
+
+    Passing an ``archive`` (possibly empty) warm-starts the fit: archived
+    params are re-scored against the current targets, the random phase
+    samples around the incumbent with ``sigma0`` instead of uniformly over
+    the bounds, and the first ES center averages the best of both.
+
+    Candidates are scored in batches through ``evaluator`` (serial by
+    default); every job carries its own seed, so any evaluator that returns
+    ``objective`` results in job order reproduces the serial fit exactly.
+
+    With ``prune`` enabled, random samples are aborted once their partial loss
+    exceeds the incumbent, and ES candidates once it exceeds the previous
+    generation's elite cutoff; cells run in the incumbent's worst-first order.
+    Only completed candidates form the elite and cutoff; when too few finish,
+    the center is kept and the next generation runs unpruned. Pruned
+    candidates never enter the archive.
+
+    ``only_difficulty`` tunes one difficulty block and freezes the rest, also
+    when warm-starting (archive entries contribute only that block); the
+    frozen cells keep the base seed so the per-cell cache serves them and
+    each candidate only simulates the tuned difficulty.
+    """
     rng = random.Random(seed)
-    best = deep_copy_params(initial_params)
-    best_score, best_info = objective(best, runs=runs, seed=seed, fast=fast)
+    evaluator = evaluator or serial_evaluator
+    fingerprint = archive_fingerprint(targets or build_default_targets(), runs, fast)
+    evaluations: List[Dict[str, Any]] = []
+    pruned = 0
+
+    def _evaluate(
+        batch: List[Tuple[Dict[str, Any], int]],
+        abort_above: float | None = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        nonlocal pruned
+        jobs = [
+            {"params": cand, "targets": targets, "runs": runs, "seed": eval_seed, "fast": fast}
+            for cand, eval_seed in batch
+        ]
+        if only_difficulty is not None:
+            frozen = {diff: seed for diff in DIFFICULTIES if diff != only_difficulty}
+            for job in jobs:
+                job["cell_seeds"] = frozen
+        if prune and abort_above is not None:
+            errors = best_info["cell_errors"]
+            order = sorted(errors, key=lambda k: errors[k], reverse=True)
+            for job in jobs:
+                job.update(abort_above=abort_above, cell_order=order)
+        results = evaluator(jobs)
+        for (cand, _), (score, info) in zip(batch, results):
+            if info.get("pruned"):
+                pruned += 1
+            else:
+                evaluations.append({"score": score, "params": cand, "fingerprint": fingerprint})
+        return results
+
+    warm = archive is not None
+    seeded_cands = [deep_copy_params(initial_params)]
+    for entry in archive or []:
+        if only_difficulty is None:
+            seeded_cands.append(deep_copy_params(entry["params"]))
+        else:
+            # Only the tuned block comes from the archive; global and other difficulties stay frozen.
+            cand = deep_copy_params(initial_params)
+            cand["difficulty"][only_difficulty] = deepcopy(entry["params"]["difficulty"][only_difficulty])
+            seeded_cands.append(cand)
+    seeded_seeds = [seed] + [seed + 2000 + ai for ai in range(len(seeded_cands) - 1)]
+    seeded: List[Tuple[float, Dict[str, Any], Dict[str, Any]]] = []
+    for cand, (score, info) in zip(seeded_cands, _evaluate(list(zip(seeded_cands, seeded_seeds)))):
+        seeded.append((score, cand, info))
+    best_score, best, best_info = min(seeded, key=lambda x: x[0])
 
-    for i in range(random_samples):
-        cand = randomize_params(initial_params, rng, scale=1.0)
-        score, info = objective(cand, runs=runs, seed=seed + i + 17, fast=fast)
+    sample_center = best if warm else initial_params
+    samples = [
+        randomize_params(sample_center, rng, scale=sigma0 if warm else 1.0, only_difficulty=only_difficulty)
+        for _ in range(random_samples)
+    ]
+    sample_results = _evaluate([(c, seed + i + 17) for i, c in enumerate(samples)], abort_above=best_score)
+    for cand, (score, info) in zip(samples, sample_results):
         if score < best_score:
             best, best_score, best_info = cand, score, info
 
-    center = deep_copy_params(best)
-    slots = _slots(center)
+    slots = _slots(best, only_difficulty)
+    if warm:
+        pool = seeded + [(score, cand, info) for cand, (score, info) in zip(samples, sample_results)]
+        pool = [entry for entry in pool if not entry[2].get("pruned")]
+        pool.sort(key=lambda x: x[0])
+        center = _recenter(pool[: max(2, pop_size // 4)], slots)
+    else:
+        center = deep_copy_params(best)
 
+    cutoff: float | None = None
     for it in range(es_iters):
-        sigma = 0.45 * (0.96 ** it)
-        generation: List[Tuple[float, Dict[str, Any], Dict[str, Any]]] = []
-        for pi in range(pop_size):
+        sigma = sigma0 * (0.96 ** it)
+        cands: List[Dict[str, Any]] = []
+        for _ in range(pop_size):
             cand = deepcopy(center)
             for path, lo, hi in slots:
                 cur = float(_get_ref(cand, path))
                 step = rng.gauss(0.0, sigma * (hi - lo))
                 _set_ref(cand, path, max(lo, min(hi, cur + step)))
             _enforce_structure(cand)
-            score, info = objective(cand, runs=runs, seed=seed + 4000 + it * 41 + pi, fast=fast)
-            generation.append((score, cand, info))
-
-        generation.sort(key=lambda x: x[0])
-        elite = generation[: max(2, pop_size // 4)]
-        if elite[0][0] < best_score:
-            best_score, best, best_info = elite[0]
-        center = deepcopy(elite[0][1])
-        for path, lo, hi in slots:
-            vals = [float(_get_ref(e[1], path)) for e in elite]
-            avg = sum(vals) / len(vals)
-            _set_ref(center, path, max(lo, min(hi, avg)))
-        _enforce_structure(center)
-
-    return best, {"score": best_score, "details": best_info}
+            cands.append(cand)
+        threshold = None if cutoff is None else max(cutoff, best_score)
+        results = _evaluate([(c, seed + 4000 + it * 41 + pi) for pi, c in enumerate(cands)], abort_above=threshold)
+        completed = [(score, cand, info) for cand, (score, info) in zip(cands, results) if not info["pruned"]]
+
+        completed.sort(key=lambda x: x[0])
+        if completed and completed[0][0] < best_score:
+            best_score, best, best_info = completed[0]
+        elite_size = max(2, pop_size // 4)
+        if len(completed) >= elite_size:
+            elite = completed[:elite_size]
+            cutoff = elite[-1][0]
+            center = _recenter(elite, slots)
+        else:
+            # Too few finished to rank an elite: keep the center and run the next generation unpruned.
+            cutoff = None
+
+    return best, {
+        "score": best_score,
+        "details": best_info,
+        "evaluations": evaluations,
+        "fingerprint": fingerprint,
+        "pruned": pruned,
+    }
+
+
+def archive_fingerprint(targets: Dict[str, Any], runs: int, fast: bool) -> str:
+    """Identify the scoring setup (targets, runs, fidelity) an archived score belongs to."""
+    key = {
+        "median_seconds": targets["median_seconds"],
+        "peak_reach": targets["peak_reach"],
+        "peak_seconds": targets.get("peak_seconds"),
+        "runs": runs,
+        "fast": fast,
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def rank_archive(archive: List[Dict[str, Any]], fingerprint: str) -> List[Dict[str, Any]]:
+    """Order archive entries for reuse.
+
+    Scores are only comparable within one fingerprint: entries scored under
+    ``fingerprint`` come first, best first; the rest follow in stored order
+    and are only useful as warm-start params.
+    """
+    current = sorted((e for e in archive if e.get("fingerprint") == fingerprint), key=lambda e: e["score"])
+    stale = [e for e in archive if e.get("fingerprint") != fingerprint]
+    return current + stale
+
+
+def merge_archive(
+    archive: List[Dict[str, Any]],
+    evaluations: List[Dict[str, Any]],
+    fingerprint: str,
+    keep: int = 64,
+) -> List[Dict[str, Any]]:
+    """Merge new evaluations into an archive and keep ``keep`` entries ranked by ``rank_archive``.
+
+    Re-scored params replace their older archive entry.
+    """
+    by_key: Dict[str, Dict[str, Any]] = {}
+    for entry in list(archive) + list(evaluations):
+        by_key[json.dumps(entry["params"], sort_keys=True)] = entry
+    return rank_archive(list(by_key.values()), fingerprint)[:keep]
@@ -14,20 +14,22 @@ if __package__ in (None, ""):
     THIS_DIR = os.path.dirname(os.path.abspath(__file__))
     if THIS_DIR not in sys.path:
         sys.path.insert(0, THIS_DIR)
-    from default_targets import BUCKETS, DIFFICULTIES, build_default_targets  # type: ignore
-    from model import default_params, objective, save_json  # type: ignore
-    from optimizer import fit  # type: ignore
+    from default_targets import DIFFICULTIES, build_default_targets, load_targets  # type: ignore
+    from model import cell_cache_info, default_params, load_json, objective, save_json  # type: ignore
+    from optimizer import archive_fingerprint, fit, merge_archive, rank_archive  # type: ignore
+    from work_queue import FileWorkQueue, run_worker  # type: ignore
 else:
-    from .default_targets import BUCKETS, DIFFICULTIES, build_default_targets
-    from .model import default_params, objective, save_json
-    from .optimizer import fit
+    from .default_targets import DIFFICULTIES, build_default_targets, load_targets
+    from .model import cell_cache_info, default_params, load_json, objective, save_json
+    from .optimizer import archive_fingerprint, fit, merge_archive, rank_archive
+    from .work_queue import FileWorkQueue, run_worker
 
 
 def _tabulate_metrics(targets: Dict[str, Any], achieved: Dict[str, Any]) -> str:
     lines = []
     lines.append("| Bucket | Difficulty | Median Target (s) | Median Achieved (s) | P1 T/A | P2 T/A | P3 T/A |")
     lines.append("|---|---:|---:|---:|---:|---:|---:|")
-    for bucket in BUCKETS:
+    for bucket in targets["median_seconds"]:
         for diff in DIFFICULTIES:
             tmed = targets["median_seconds"][bucket][diff]
             amed = achieved[bucket][diff]["median_seconds"]
@@ -50,7 +52,13 @@ def _tabulate_metrics(targets: Dict[str, Any], achieved: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def _sensitivity_notes(params: Dict[str, Any], runs: int, seed: int, fast: bool) -> List[str]:
+def _sensitivity_notes(
+    params: Dict[str, Any],
+    targets: Dict[str, Any],
+    runs: int,
+    seed: int,
+    fast: bool,
+) -> List[str]:
     probes: List[Tuple[Tuple[str, ...], str]] = [
         (("global", "tau"), "Global tail time constant"),
         (("global", "kdd"), "Dual-drop load multiplier"),
@@ -58,7 +66,7 @@ def _sensitivity_notes(params: Dict[str, Any], runs: int, seed: int, fast: bool)
         (("difficulty", "nm", "A1"), "NM first peak amplitude"),
     ]
 
-    base_score, _ = objective(params, runs=runs, seed=seed, fast=fast)
+    base_score, _ = objective(params, targets=targets, runs=runs, seed=seed, fast=fast)
     notes: List[str] = []
     for path, label in probes:
         trial = deepcopy(params)
@@ -67,14 +75,14 @@ def _sensitivity_notes(params: Dict[str, Any], runs: int, seed: int, fast: bool)
             ref = ref[key]
         k = path[-1]
         ref[k] = float(ref[k]) * 1.05
-        hi_score, _ = objective(trial, runs=max(60, runs // 3), seed=seed + 111, fast=True)
+        hi_score, _ = objective(trial, targets=targets, runs=max(60, runs // 3), seed=seed + 111, fast=True)
 
         trial2 = deepcopy(params)
         ref2 = trial2
         for key in path[:-1]:
             ref2 = ref2[key]
         ref2[k] = float(ref2[k]) * 0.95
-        lo_score, _ = objective(trial2, runs=max(60, runs // 3), seed=seed + 222, fast=True)
+        lo_score, _ = objective(trial2, targets=targets, runs=max(60, runs // 3), seed=seed + 111, fast=True)
 
         notes.append(
             f"- {label}: baseline={base_score:.4f}, +5% => {hi_score:.4f}, -5% => {lo_score:.4f}."
@@ -82,6 +90,10 @@ def _sensitivity_notes(params: Dict[str, Any], runs: int, seed: int, fast: bool)
     return notes
 
 
+def _abs_path(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(os.getcwd(), path)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Fit no-skill baseline balance coefficients with stochastic simulation.")
     parser.add_argument("--runs", type=int, default=500, help="Simulation runs per (difficulty, bucket) pair")
@@ -93,36 +105,108 @@ def main() -> None:
         default="Tools/BalanceOpt/best_params.json",
         help="Output JSON path for best parameters",
     )
+    parser.add_argument(
+        "--targets",
+        type=str,
+        default=None,
+        help="Targets JSON (e.g. from ingest_telemetry.py); defaults to default_targets.py constants",
+    )
+    parser.add_argument(
+        "--archive",
+        type=str,
+        default="Tools/BalanceOpt/eval_archive.json",
+        help="JSON archive of previously evaluated (params, score) pairs",
+    )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="Seed the fit from the existing --out params and --archive with a short, narrow search",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Abort candidate evaluations whose partial loss already exceeds the incumbent or elite cutoff",
+    )
+    parser.add_argument(
+        "--only-difficulty",
+        choices=DIFFICULTIES,
+        default=None,
+        help="Tune only this difficulty's block, keeping global and other difficulties fixed",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        help="Shared directory work queue; distributes fit evaluations to --worker processes",
+    )
+    parser.add_argument("--worker", action="store_true", help="Serve evaluations from --queue instead of fitting")
+    parser.add_argument("--job-timeout", type=float, default=600.0, help="Seconds after a worker claims a job before it is re-issued")
     args = parser.parse_args()
 
+    if args.worker:
+        if not args.queue:
+            parser.error("--worker requires --queue")
+        done = run_worker(args.queue)
+        print(f"Worker evaluated {done} jobs")
+        return
+
     if args.fast:
         rand_samples, es_iters, pop = 18, 20, 8
     else:
         rand_samples, es_iters, pop = 36, 42, 12
 
-    base = default_params()
-    best, opt_info = fit(
-        initial_params=base,
-        runs=args.runs,
-        seed=args.seed,
-        fast=args.fast,
-        random_samples=rand_samples,
-        es_iters=es_iters,
-        pop_size=pop,
-    )
+    targets = load_targets(_abs_path(args.targets)) if args.targets else build_default_targets()
+    if len(targets["median_seconds"]) > 1:
+        parser.error(
+            f"--targets has buckets {list(targets['median_seconds'])}; the simulator ignores player day, "
+            "so fit against single-bucket targets (ingest_telemetry.py --day-edges 0)"
+        )
+    out_path = _abs_path(args.out)
+    archive_path = _abs_path(args.archive)
+    archive = load_json(archive_path) if os.path.exists(archive_path) else []
+
+    if args.warm_start:
+        if not os.path.exists(out_path):
+            parser.error(f"--warm-start needs prior params at {out_path}")
+        base = load_json(out_path)
+        warm_archive = rank_archive(archive, archive_fingerprint(targets, args.runs, args.fast))[:pop]
+        rand_samples, es_iters, sigma0 = rand_samples // 6, es_iters // 2, 0.15
+    else:
+        base = default_params()
+        warm_archive = None
+        sigma0 = 0.45
+
+    queue = FileWorkQueue(args.queue, timeout=args.job_timeout) if args.queue else None
+    try:
+        best, opt_info = fit(
+            initial_params=base,
+            runs=args.runs,
+            seed=args.seed,
+            fast=args.fast,
+            random_samples=rand_samples,
+            es_iters=es_iters,
+            pop_size=pop,
+            archive=warm_archive,
+            sigma0=sigma0,
+            evaluator=queue,
+            prune=args.prune,
+            targets=targets,
+            only_difficulty=args.only_difficulty,
+        )
+    finally:
+        if queue is not None:
+            queue.stop()
 
-    out_path = args.out
-    if not os.path.isabs(out_path):
-        out_path = os.path.join(os.getcwd(), out_path)
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     save_json(out_path, best)
+    os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+    save_json(archive_path, merge_archive(archive, opt_info["evaluations"], opt_info["fingerprint"]))
 
-    final_score, eval_info = objective(best, runs=args.runs, seed=args.seed + 999, fast=args.fast)
-    targets = eval_info["targets"]
+    final_score, eval_info = objective(best, targets=targets, runs=args.runs, seed=args.seed + 999, fast=args.fast)
     achieved = eval_info["metrics"]
 
     report_path = os.path.join(os.getcwd(), "Tools/BalanceOpt/report.md")
-    notes = _sensitivity_notes(best, runs=min(220, args.runs), seed=args.seed + 333, fast=True)
+    notes = _sensitivity_notes(best, targets, runs=min(220, args.runs), seed=args.seed + 333, fast=True)
 
     report = []
     report.append("# Balance Optimization Report")
@@ -130,6 +214,10 @@ def main() -> None:
     report.append(f"Generated: {datetime.now(timezone.utc).isoformat()}Z")
     report.append(f"Final objective score: {final_score:.6f}")
     report.append(f"Optimizer internal best score: {opt_info['score']:.6f}")
+    if args.prune:
+        report.append(f"Pruned evaluations: {opt_info['pruned']}")
+    cache = cell_cache_info()
+    report.append(f"Cell cache (this process): {cache.hits} hits, {cache.misses} misses")
     report.append("")
     report.append("## Targets vs Achieved")
     report.append("")
@@ -145,13 +233,19 @@ def main() -> None:
     report.extend(notes)
     report.append("")
     report.append("## Notes")
-    report.append("- Optimization targets only the no-skill BASE bucket.")
+    if args.only_difficulty:
+        report.append(f"- Only the `{args.only_difficulty}` difficulty block was tuned.")
+    if args.targets:
+        report.append(f"- Targets loaded from `{args.targets}` (bucket {', '.join(targets['median_seconds'])}).")
+    else:
+        report.append("- Optimization targets only the no-skill BASE bucket.")
     report.append("- Skill effects are intentionally excluded from this baseline model.")
 
     with open(report_path, "w", encoding="utf-8") as f:
         f.write("\n".join(report) + "\n")
 
     print(f"Saved best params to: {out_path}")
+    print(f"Saved evaluation archive to: {archive_path}")
     print(f"Saved report to: {report_path}")
     print(f"Final objective score: {final_score:.6f}")
 
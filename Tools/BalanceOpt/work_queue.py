@@ -0,0 +1,183 @@
+"""Shared-directory work queue for distributing objective evaluations across hosts."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+try:
+    from .model import objective
+except ImportError:
+    from model import objective
+
+
+PENDING = "pending"
+CLAIMED = "claimed"
+RESULTS = "results"
+STOP = "STOP"
+
+
+def _write_atomic(path: str, data: Any) -> None:
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class FileWorkQueue:
+    """Coordinator side of a work queue living in a shared directory.
+
+    Jobs are published as ``pending/<id>.json``; a worker claims one by
+    renaming it into ``claimed/`` and answers with ``results/<id>.json``.
+    A claimed job without a result ``timeout`` seconds after the coordinator
+    first sees its claim is re-published; jobs still waiting in ``pending/``
+    never time out, so the timeout only has to cover one evaluation, not the
+    queue wait. Results for ids that are no longer outstanding are discarded,
+    so a slow or crashed worker never changes the outcome.
+    """
+
+    def __init__(self, root: str, timeout: float = 600.0, poll: float = 0.2) -> None:
+        self.root = root
+        self.timeout = timeout
+        self.poll = poll
+        self.session = uuid.uuid4().hex[:8]
+        self._batch = 0
+        for sub in (PENDING, CLAIMED, RESULTS):
+            os.makedirs(os.path.join(root, sub), exist_ok=True)
+        self._clear()
+        _remove(os.path.join(root, STOP))
+
+    def _clear(self) -> None:
+        for sub in (PENDING, CLAIMED, RESULTS):
+            for name in os.listdir(os.path.join(self.root, sub)):
+                _remove(os.path.join(self.root, sub, name))
+
+    def _path(self, sub: str, job_id: str) -> str:
+        return os.path.join(self.root, sub, f"{job_id}.json")
+
+    def _publish(self, job_id: str, job: Dict[str, Any]) -> None:
+        _write_atomic(self._path(PENDING, job_id), {"id": job_id, "job": job})
+
+    def __call__(self, jobs: List[Dict[str, Any]]) -> List[Tuple[float, Dict[str, Any]]]:
+        """Evaluate ``objective`` keyword-argument jobs on remote workers, in order."""
+        self._batch += 1
+        ids = [f"{self.session}-{self._batch:06d}-{i:04d}" for i in range(len(jobs))]
+        outstanding = set(ids)
+        for job_id, job in zip(ids, jobs):
+            self._publish(job_id, job)
+        claimed_at: Dict[str, float] = {}
+
+        results: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        while len(results) < len(ids):
+            for name in os.listdir(os.path.join(self.root, RESULTS)):
+                if not name.endswith(".json"):
+                    continue
+                job_id = name[:-5]
+                path = self._path(RESULTS, job_id)
+                if job_id not in outstanding or job_id in results:
+                    _remove(path)
+                    continue
+                try:
+                    payload = _read(path)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    continue
+                if "error" in payload:
+                    raise RuntimeError(f"Worker {payload.get('worker')} failed on {job_id}: {payload['error']}")
+                results[job_id] = (payload["score"], payload["info"])
+                _remove(path)
+                _remove(self._path(CLAIMED, job_id))
+                _remove(self._path(PENDING, job_id))
+
+            now = time.monotonic()
+            for job_id, job in zip(ids, jobs):
+                if job_id in results:
+                    continue
+                if job_id not in claimed_at:
+                    if os.path.exists(self._path(CLAIMED, job_id)):
+                        claimed_at[job_id] = now
+                elif now - claimed_at[job_id] > self.timeout:
+                    _remove(self._path(CLAIMED, job_id))
+                    self._publish(job_id, job)
+                    del claimed_at[job_id]
+            if len(results) < len(ids):
+                time.sleep(self.poll)
+
+        return [results[job_id] for job_id in ids]
+
+    def stop(self) -> None:
+        """Drop leftover jobs and late duplicate results, then tell workers to exit."""
+        self._clear()
+        _write_atomic(os.path.join(self.root, STOP), {"session": self.session})
+
+
+def _stop_session(root: str) -> str | None:
+    try:
+        return _read(os.path.join(root, STOP)).get("session")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def run_worker(root: str, poll: float = 0.5) -> int:
+    """Claim and evaluate queued jobs until the coordinator writes STOP.
+
+    A STOP left over from an earlier coordinator is ignored; the worker exits
+    on a STOP for a session it has served or one written after it started.
+    Sessions are compared instead of file times, which may come from a
+    file server whose clock differs from this host's.
+
+    Returns the number of jobs evaluated.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stale_session = _stop_session(root)
+    seen_sessions = set()
+    pending_dir = os.path.join(root, PENDING)
+    for sub in (PENDING, CLAIMED, RESULTS):
+        os.makedirs(os.path.join(root, sub), exist_ok=True)
+
+    done = 0
+    while True:
+        names = sorted(n for n in os.listdir(pending_dir) if n.endswith(".json"))
+        if not names:
+            session = _stop_session(root)
+            if session is not None and (session in seen_sessions or session != stale_session):
+                return done
+            time.sleep(poll)
+            continue
+
+        for name in names:
+            claimed = os.path.join(root, CLAIMED, name)
+            try:
+                os.replace(os.path.join(pending_dir, name), claimed)
+                payload = _read(claimed)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            session = payload["id"].split("-")[0]
+            seen_sessions.add(session)
+            try:
+                score, info = objective(**payload["job"])
+                result: Dict[str, Any] = {"score": score, "info": info, "worker": worker_id}
+            except Exception as exc:  # reported back to the coordinator
+                result = {"error": repr(exc), "worker": worker_id}
+            if _stop_session(root) == session:
+                # Late duplicate for a finished fit; nobody will collect it.
+                _remove(claimed)
+            else:
+                _write_atomic(os.path.join(root, RESULTS, name), result)
+            done += 1
+            break